@@ -1,5 +1,7 @@
 import csv
 import os
+import threading
+from typing import Dict, Optional
 
 
 class excel_semicolon(csv.excel):
@@ -8,14 +10,42 @@ class excel_semicolon(csv.excel):
     delimiter = ";"
 
 
-def get_bank_information_by_blz(blz):
-    this_dir, this_filename = os.path.split(__file__)
-    DATA_PATH = os.path.join(this_dir, "data", "banks.csv")
+BLZ_COLUMNS = ("BLZ", "Bankleitzahl")
+
+_BANKS_BY_BLZ: Optional[Dict[str, dict]] = None
+_BANKS_LOCK = threading.Lock()
+
+
+def _load_banks() -> Dict[str, dict]:
+    """Parse banks.csv once and index it by (stripped) BLZ.
 
-    with open(DATA_PATH, newline="", encoding="cp1252") as data_file:
-        reader = csv.DictReader(data_file, dialect=excel_semicolon)
-        for row in reader:
-            if row["BLZ"].strip() == blz.strip():
-                return row
+    The BLZ column name and the delimiter are detected from the file, so both
+    the current export and the Bundesbank format ("Bankleitzahl") are accepted."""
+    global _BANKS_BY_BLZ
+    with _BANKS_LOCK:
+        if _BANKS_BY_BLZ is None:
+            this_dir, this_filename = os.path.split(__file__)
+            DATA_PATH = os.path.join(this_dir, "data", "banks.csv")
 
-    return {"BLZ": blz}
+            with open(DATA_PATH, newline="", encoding="cp1252") as data_file:
+                try:
+                    dialect = csv.Sniffer().sniff(data_file.read(4096), delimiters=";,")
+                except csv.Error:
+                    dialect = excel_semicolon
+                data_file.seek(0)
+                reader = csv.DictReader(data_file, dialect=dialect)
+                blz_column = next(
+                    (c for c in BLZ_COLUMNS if c in (reader.fieldnames or ())),
+                    BLZ_COLUMNS[0],
+                )
+                banks = {}
+                for row in reader:
+                    # Keep the first entry for a BLZ, like the linear scan did
+                    banks.setdefault((row.get(blz_column) or "").strip(), row)
+            _BANKS_BY_BLZ = banks
+    return _BANKS_BY_BLZ
+
+
+def get_bank_information_by_blz(blz):
+    banks = _BANKS_BY_BLZ if _BANKS_BY_BLZ is not None else _load_banks()
+    return banks.get(blz.strip(), {"BLZ": blz})
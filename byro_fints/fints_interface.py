@@ -1,86 +1,252 @@
 import abc
+import copy
+import hashlib
+import hmac
+import io
 import logging
 import pickle
+import threading
+import time
 import uuid
-from argparse import Namespace
+import weakref
+import zlib
 from base64 import b64encode, b64decode
+from collections import OrderedDict
 from contextvars import ContextVar
 from enum import Enum
-from functools import wraps, partial
-from typing import Optional, Set, Tuple, Dict, ContextManager, List, TypeVar, Callable
-
-from fints.formals import TANMediaType2, TANMediaClass4
-from fints.hhd.flicker import parse as hhd_flicker_parse
+from functools import wraps
+from http.cookiejar import DefaultCookiePolicy
+from typing import Optional, Tuple, Dict, ContextManager, List, TypeVar
 
 import django.http
+import requests
 from django import forms
 from django.contrib import messages
+from django.core.exceptions import PermissionDenied
 from django.db.transaction import atomic
 from django.utils.safestring import mark_safe
 from django.utils.translation import ugettext_lazy as _
 from django_securebox.utils import Storage
 from fints.client import FinTS3PinTanClient, FinTSClientMode, NeedTANResponse
-from fints.exceptions import FinTSClientPINError
-from fints.segments.auth import HKTAB4, HKTAB5
-from fints.types import SegmentSequence
+from fints.connection import FinTSHTTPSConnection
+from fints.exceptions import FinTSConnectionError
+from fints.message import FinTSInstituteMessage, FinTSMessage
+from fints.types import Container, ValueList
+from fints.utils import Password
 
 from .models import FinTSUserLogin
 
 BYRO_FINTS_PRODUCT_ID = "F41CDA6B1F8E0DADA0DDA29FD"
 PIN_CACHED_SENTINEL = "******"
+SESSION_STATE_VERSION = b"\x01"
+SESSION_COMPRESSED_MAGIC = b"Z1"
+SESSION_COMPRESS_THRESHOLD = 512
+READONLY_CLIENT_POOL_SIZE = 32
+READONLY_CLIENT_POOL_TTL = 60  # seconds
+
+_UNSET = object()
+
+# FinTS response code classes: 0xxx success, 3xxx warning, 9xxx error
+_RESPONSE_MESSAGE_HANDLERS = {
+    "0": messages.info,
+    "3": messages.warning,
+    "9": messages.error,
+}
 
 logger = logging.getLogger(__name__)
-open_clients: ContextVar[Optional[Set[FinTS3PinTanClient]]] = ContextVar('open_clients', default=None)
-resumed_dialogs: ContextVar[Optional[Dict[FinTS3PinTanClient, ContextManager]]] = ContextVar('resumed_dialogs',
-                                                                                             default=None)
-with_fints_active: ContextVar[int] = ContextVar('with_fints_active', default=0)
+
+
+class _FinTSState:
+    """Bookkeeping for one (outermost) @with_fints call, mutated in place."""
+
+    __slots__ = ("open_clients",)
+
+    def __init__(self):
+        # Maps id(client) to (client, resumed dialog context manager or None)
+        self.open_clients: Dict[int, Tuple[FinTS3PinTanClient, Optional[ContextManager]]] = {}
+
+
+fints_state: ContextVar[Optional[_FinTSState]] = ContextVar('fints_state', default=None)
+
+_readonly_client_pool: "OrderedDict[Tuple, Tuple[FinTS3PinTanClient, float]]" = OrderedDict()
+_readonly_client_pool_lock = threading.Lock()
+# get_information() results of pooled readonly clients, dropped with the client
+_readonly_client_information: "weakref.WeakKeyDictionary[FinTS3PinTanClient, dict]" = (
+    weakref.WeakKeyDictionary()
+)
+
+# requests.Session objects are not safe to share between threads, so keep one
+# per thread and FinTS URL; dialogs in later requests then reuse the connection
+_http_sessions = threading.local()
 
 
 def _encode_binary_for_session(data: bytes) -> str:
+    if len(data) > SESSION_COMPRESS_THRESHOLD:
+        data = SESSION_COMPRESSED_MAGIC + zlib.compress(data, 6)
     return b64encode(data).decode("us-ascii")
 
 
 def _decode_binary_for_session(data: str) -> bytes:
-    return b64decode(data.encode("us-ascii"))
+    data = b64decode(data.encode("us-ascii"))
+    if data[:2] == SESSION_COMPRESSED_MAGIC:
+        return zlib.decompress(data[2:])
+    return data
+
+
+def _serialize_state(data: Tuple) -> bytes:
+    """Serialize helper state, prefixed with a format version byte."""
+    return SESSION_STATE_VERSION + pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _deserialize_state(data: bytes) -> Tuple:
+    if data[:1] == SESSION_STATE_VERSION:
+        return pickle.loads(data[1:])
+    # Legacy sessions: plain pickle without version prefix
+    return pickle.loads(data)
+
+
+def _get_http_session(url: str) -> requests.Session:
+    sessions = getattr(_http_sessions, "by_url", None)
+    if sessions is None:
+        sessions = _http_sessions.by_url = {}
+    session = sessions.get(url)
+    if session is None:
+        session = sessions[url] = requests.Session()
+        # Shared between dialogs (and users), so it must never store cookies;
+        # each connection keeps its own jar instead
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+
+class KeepAliveFinTSHTTPSConnection(FinTSHTTPSConnection):
+    """FinTSHTTPSConnection that sends all messages through a per-thread
+    requests.Session for the URL, so that the HTTPS connection (and TLS session)
+    is reused within a dialog and across clients. Cookies are kept in a jar of
+    the connection (i.e. of one dialog), never in the shared session."""
+
+    def __init__(self, url):
+        super().__init__(url)
+        self.session = _get_http_session(url)
+        self.cookies = requests.cookies.RequestsCookieJar()
+
+    @staticmethod
+    def _log_message(direction: str, msg):
+        if logger.isEnabledFor(logging.DEBUG):
+            log_out = io.StringIO()
+            with Password.protect():
+                msg.print_nested(stream=log_out, prefix="\t")
+            logger.debug("%s\n%s", direction, log_out.getvalue())
+
+    def send(self, msg: FinTSMessage):
+        self._log_message("Sending >>>", msg)
+        r = self.session.post(
+            self.url,
+            data=b64encode(msg.render_bytes()),
+            headers={
+                "Content-Type": "text/plain",
+            },
+            cookies=self.cookies,
+        )
+        self.cookies.update(r.cookies)
+
+        if r.status_code < 200 or r.status_code > 299:
+            raise FinTSConnectionError("Bad status code {}".format(r.status_code))
+
+        response = b64decode(r.content.decode("iso-8859-1"))
+        retval = FinTSInstituteMessage(segments=response)
+        self._log_message("Received <<<", retval)
+        return retval
+
+
+def _get_pooled_readonly_client(key: Tuple) -> Optional[FinTS3PinTanClient]:
+    with _readonly_client_pool_lock:
+        entry = _readonly_client_pool.get(key)
+        if entry is None:
+            return None
+        client, timestamp = entry
+        if time.monotonic() - timestamp > READONLY_CLIENT_POOL_TTL:
+            del _readonly_client_pool[key]
+            return None
+        _readonly_client_pool.move_to_end(key)
+        return client
+
+
+def _put_pooled_readonly_client(key: Tuple, client: FinTS3PinTanClient):
+    with _readonly_client_pool_lock:
+        _readonly_client_pool[key] = (client, time.monotonic())
+        _readonly_client_pool.move_to_end(key)
+        while len(_readonly_client_pool) > READONLY_CLIENT_POOL_SIZE:
+            _readonly_client_pool.popitem(last=False)
+
+
+def _copy_information(value):
+    """Copy a get_information() result, including the fints containers in it.
+    copy.deepcopy() can't be used here, it loses the field values of containers."""
+    if isinstance(value, dict):
+        return {k: _copy_information(v) for (k, v) in value.items()}
+    if isinstance(value, (list, ValueList)):
+        return [_copy_information(v) for v in value]
+    if isinstance(value, Container):
+        return type(value)(**{name: _copy_information(getattr(value, name)) for name in value._fields})
+    return value
 
 
 def with_fints(wrapped):
     @wraps(wrapped)
     def f(*args, **kwargs):
+        # Only the outermost call sets up the state, nested calls share it
+        token = fints_state.set(_FinTSState()) if fints_state.get() is None else None
         try:
-            with_fints_active.set(with_fints_active.get() + 1)
             return wrapped(*args, **kwargs)
         finally:
             try:
                 _ensure_close_clients()
             finally:
-                with_fints_active.set(with_fints_active.get() - 1)
+                if token is not None:
+                    fints_state.reset(token)
 
     return f
 
 
+def _get_open_clients() -> Dict[int, Tuple[FinTS3PinTanClient, Optional[ContextManager]]]:
+    state = fints_state.get()
+    assert state is not None, "May only handle FinTS clients in function marked with @with_fints."
+    return state.open_clients
+
+
 def _ensure_close_clients():
-    rd = resumed_dialogs.get() or dict()
-    for client in (open_clients.get() or set()):
+    ocl = _get_open_clients()
+    if not ocl:
+        return
+    for client, resumed_dialog in ocl.values():
         logger.error("Client %s was not closed", client)
-        if client in rd:
-            rd[client].__exit__(None, None, None)
+        if resumed_dialog is not None:
+            resumed_dialog.__exit__(None, None, None)
         else:
             client.__exit__(None, None, None)
-    open_clients.set(set())
-    resumed_dialogs.set(dict())
+    ocl.clear()
+
+
+class _FakeTANMedium:
+    """Stand-in for TANMedia4/TANMedia5, set_tan_medium() only reads the name."""
+
+    __slots__ = ("tan_medium_name",)
+
+    def __init__(self, tan_medium_name: str):
+        self.tan_medium_name = tan_medium_name
 
 
 def _inner_open_client(*args, tan_medium_name=None, tan_mechanism=None, **kwargs) -> FinTS3PinTanClient:
-    assert with_fints_active.get(), "May only call open_client() in function marked with @with_fints."
+    assert fints_state.get() is not None, "May only call open_client() in function marked with @with_fints."
     client = FinTS3PinTanClient(*args, **kwargs)
+    client.connection = KeepAliveFinTSHTTPSConnection(client.connection.url)
 
     # Note: This doesn't belong here, but needs to be called before __enter__
     if tan_mechanism is not None:
         client.set_tan_mechanism(tan_mechanism)
-    if tan_medium_name is not None:
+    if tan_medium_name is not None and client.selected_tan_medium != tan_medium_name:
         # HACK HACK HACK We can't restore the TanMedia objects, and set_tan_medium uses only the name anyway
-        fake_tan_medium = Namespace(tan_medium_name=tan_medium_name)
+        fake_tan_medium = _FakeTANMedium(tan_medium_name)
         client.set_tan_medium(fake_tan_medium)
 
     return client
@@ -91,11 +257,9 @@ def open_client(*args, **kwargs) -> FinTS3PinTanClient:
     The client will be created with an open dialog. You may need to handle a TAN request
     if client.init_tan_response is set. You need to remember to call close_client()
     within the same method."""
-    ocl = open_clients.get() or set()
     client = _inner_open_client(*args, **kwargs)
     client.__enter__()
-    ocl.add(client)
-    open_clients.set(ocl)
+    _get_open_clients()[id(client)] = (client, None)
     return client
 
 
@@ -105,10 +269,10 @@ def pause_client(client: FinTS3PinTanClient) -> Tuple[bytes, bytes]:
     a dialog if you need to get user TAN input. Normal exit should close the client.
     Note: FinTS3PinTanClient.deconstruct() will always be called with
     including_private=True, since it doesn't make sense to pause a dialog otherwise."""
-    ocl = open_clients.get() or set()
-    assert client in ocl
+    ocl = _get_open_clients()
+    assert id(client) in ocl
     dialog_data = client.pause_dialog()
-    client_data = close_client(client, True)
+    client_data = _close_client(ocl, client, True)
     return client_data, dialog_data
 
 
@@ -116,30 +280,26 @@ def resume_client(*args, client_data, dialog_data, **kwargs) -> FinTS3PinTanClie
     """Resume a previously paused dialog. You need to provide all FinTS3PinTanClient
     constructor arguments and client_data and dialog_data keyword arguments (as returned
     from pause_client)."""
-    ocl = open_clients.get() or set()
-    rd = resumed_dialogs.get() or dict()
     client = _inner_open_client(from_data=client_data, *args, **kwargs)
-    rd[client] = client.resume_dialog(dialog_data)
-    rd[client].__enter__()
-    ocl.add(client)
-    open_clients.set(ocl)
-    resumed_dialogs.set(rd)
+    resumed_dialog = client.resume_dialog(dialog_data)
+    resumed_dialog.__enter__()
+    _get_open_clients()[id(client)] = (client, resumed_dialog)
     return client
 
 
 def close_client(client: FinTS3PinTanClient, including_private: bool = False) -> bytes:
     """Close a client (and dialog). Call this before exiting your function.
     Same argument and return value as FinTS3PinTanClient.deconstruct()."""
-    ocl = open_clients.get() or set()
-    rd = resumed_dialogs.get() or dict()
-    assert client in ocl
+    ocl = _get_open_clients()
+    assert id(client) in ocl
+    return _close_client(ocl, client, including_private)
+
+
+def _close_client(ocl: Dict, client: FinTS3PinTanClient, including_private: bool) -> bytes:
     client_data = client.deconstruct(including_private=including_private)
-    ocl.remove(client)
-    open_clients.set(ocl)
-    if client in rd:
-        rd[client].__exit__(None, None, None)
-        del rd[client]
-        resumed_dialogs.set(rd)
+    _client, resumed_dialog = ocl.pop(id(client))
+    if resumed_dialog is not None:
+        resumed_dialog.__exit__(None, None, None)
     else:
         client.__exit__(None, None, None)
     return client_data
@@ -153,20 +313,74 @@ class PinState(Enum):
     SAVE_PERSISTENT = "save_persistent"
 
 
+# Securebox storage for the PIN states that keep the PIN there
+_PIN_STORAGE = {
+    PinState.SAVE_TEMPORARY: Storage.TRANSIENT_ONLY,
+    PinState.SAVE_PERSISTENT: Storage.PERMANENT_ONLY,
+}
+
+# Field templates for augment_form_pin_fields(). Each form gets its own
+# copy, since callers adjust attributes like initial on the form's field.
+_PIN_FIELD_TEMPLATE = forms.CharField(
+    label=_("PIN"),
+    widget=forms.PasswordInput(render_value=True),
+    required=True,
+)
+_STORE_PIN_FIELD_TEMPLATE = forms.ChoiceField(
+    label=_("Store PIN?"),
+    choices=[
+        [PinState.DONTSAVE.value, _("Don't store PIN")],
+        [PinState.SAVE_TEMPORARY.value, _("For this login session only")],
+        [
+            PinState.SAVE_PERSISTENT.value,
+            _("Store PIN (encrypted with account password)"),
+        ],
+    ],
+)
+
+
 class AbstractFinTSHelper(metaclass=abc.ABCMeta):
     SAVE_PIN_IN_RESUME = False
 
+    __slots__ = (
+        "request",
+        "resume_id",
+        "_resume_label",
+        "_pin",
+        "client",
+        "_readonly_client",
+        "_readonly_client_key",
+        "_tan_mechanisms_client",
+        "_tan_media_client",
+        "pin_state",
+        "dialog_data",
+        "init_tan_request_serialized",
+        "_init_tan_request_segment",
+        "tan_request_serialized",
+        "tan_mechanism",
+        "tan_medium",
+        "tan_mechanisms",
+        "tan_media",
+    )
+
     def __init__(self, request):
         # Volatile state
         self.request = request
         self.resume_id: Optional[str] = str(uuid.uuid4())
+        self._resume_label: Optional[str] = None
         self._pin: Optional[str] = None
         self.client: Optional[FinTS3PinTanClient] = None
+        self._readonly_client: Optional[FinTS3PinTanClient] = None
+        self._readonly_client_key: Optional[Tuple] = None
+        # Client that tan_mechanisms/tan_media were last fetched with
+        self._tan_mechanisms_client: Optional[FinTS3PinTanClient] = None
+        self._tan_media_client: Optional[FinTS3PinTanClient] = None
 
         # Saved state
         self.pin_state: PinState = PinState.NONE
         self.dialog_data: Optional[bytes] = None
         self.init_tan_request_serialized: Optional[bytes] = None
+        self._init_tan_request_segment = None  # Parsed form of the above, if still at hand
         self.tan_request_serialized: Optional[bytes] = None
         self.tan_mechanism: Optional[str] = None
         self.tan_medium: Optional[str] = None
@@ -175,24 +389,10 @@ class AbstractFinTSHelper(metaclass=abc.ABCMeta):
 
     def augment_form_pin_fields(self, form: forms.Form):
         if "pin" not in form.fields:
-            form.fields["pin"] = forms.CharField(
-                label=_("PIN"),
-                widget=forms.PasswordInput(render_value=True),
-                required=True,
-            )
+            form.fields["pin"] = copy.deepcopy(_PIN_FIELD_TEMPLATE)
         if "store_pin" not in form.fields:
-            form.fields["store_pin"] = forms.ChoiceField(
-                label=_("Store PIN?"),
-                choices=[
-                    [PinState.DONTSAVE.value, _("Don't store PIN")],
-                    [PinState.SAVE_TEMPORARY.value, _("For this login session only")],
-                    [
-                        PinState.SAVE_PERSISTENT.value,
-                        _("Store PIN (encrypted with account password)"),
-                    ],
-                ],
-                initial=self.pin_state.value,
-            )
+            form.fields["store_pin"] = copy.deepcopy(_STORE_PIN_FIELD_TEMPLATE)
+            form.fields["store_pin"].initial = self.pin_state.value
 
     def augment_form_tan_fields(self, form: forms.Form):
         client = self.get_readonly_client()
@@ -232,12 +432,15 @@ class AbstractFinTSHelper(metaclass=abc.ABCMeta):
                 store_pin = PinState.SAVE_ON_RESUME
 
             pin = form.cleaned_data["pin"]
-            if pin != PIN_CACHED_SENTINEL:
+            # Compare as bytes, compare_digest() rejects non-ASCII str
+            if not hmac.compare_digest(pin.encode("utf-8"), PIN_CACHED_SENTINEL.encode("utf-8")):
                 self.save_pin(store_pin, pin)
 
     @property
     def resume_label(self):
-        return "byro_fints:resume:%s" % self.resume_id
+        if self._resume_label is None:
+            self._resume_label = "byro_fints:resume:%s" % self.resume_id
+        return self._resume_label
 
     def _get_data_for_session(self) -> Tuple:
         return (
@@ -254,14 +457,18 @@ class AbstractFinTSHelper(metaclass=abc.ABCMeta):
     @atomic
     def save_in_session(self) -> str:
         if self.client:
+            # deconstruct() can't be skipped when pausing a dialog, but the
+            # result often equals the client data we started with
             client_data, self.dialog_data = pause_client(self.client)
-            self._do_save_client_data(client_data)
+            if client_data != self.from_data:
+                self._do_save_client_data(client_data)
             self.client = None
 
         data = (self.__class__.__name__,) + self._get_data_for_session()
-        self.request.session[self.resume_label] = _encode_binary_for_session(
-            pickle.dumps(data)
-        )
+        encoded = _encode_binary_for_session(_serialize_state(data))
+        # Only assign (and thus mark the session as modified) if something changed
+        if self.request.session.get(self.resume_label) != encoded:
+            self.request.session[self.resume_label] = encoded
 
         # PIN saved under resume_id is saved here
         if self.pin_state is PinState.SAVE_ON_RESUME:
@@ -287,7 +494,8 @@ class AbstractFinTSHelper(metaclass=abc.ABCMeta):
     def restore_from_session(cls, request, resume_id: str):
         retval = cls(request)
         retval.resume_id = resume_id
-        data = pickle.loads(
+        retval._resume_label = None
+        data = _deserialize_state(
             _decode_binary_for_session(request.session[retval.resume_label])
         )
         assert data[0] == retval.__class__.__name__
@@ -303,17 +511,12 @@ class AbstractFinTSHelper(metaclass=abc.ABCMeta):
         self.request.securebox.delete_value(self.resume_label + "/pin")
 
     def fints_callback(self, segment, response):
-        l_ = None
-        if response.code.startswith("0"):
-            l_ = partial(messages.info, self.request)
-        elif response.code.startswith("9"):
-            l_ = partial(messages.info, self.request)
-        elif response.code.startswith("0"):
-            l_ = partial(messages.info, self.request)
-        if l_:
-            l_(
-                "{} \u2014 {}".format(response.code, response.text)
-                + ("({})".format(response.parameters) if response.parameters else "")
+        handler = _RESPONSE_MESSAGE_HANDLERS.get(response.code[:1])
+        if handler:
+            handler(
+                self.request,
+                f"{response.code} \u2014 {response.text}"
+                + (f"({response.parameters})" if response.parameters else ""),
             )
 
     def open(self):
@@ -337,15 +540,18 @@ class AbstractFinTSHelper(metaclass=abc.ABCMeta):
             else:
                 self.client = open_client(*args, from_data=self.from_data, **kwargs)
                 if getattr(self.client, "init_tan_response", None):
+                    from fints.types import SegmentSequence
+
                     # FIXME See python-fints#114
+                    self._init_tan_request_segment = self.client.init_tan_response.tan_request
                     self.init_tan_request_serialized = SegmentSequence(
-                        [self.client.init_tan_response.tan_request]
+                        [self._init_tan_request_segment]
                     ).render_bytes()
             self.client.add_response_callback(self.fints_callback)
             # FIXME Handle FinTSClientPINError
         # except FinTSClientPINError:
         #     # PIN wrong, clear cached PIN, indicate error
-        #     self.request.securebox.delete_value(_cache_label(fints_login))
+        #     self.request.securebox.delete_value(fints_login.pin_cache_label)
         #     if form:
         #         form.add_error(
         #             None, _("Can't establish FinTS dialog: Username/PIN wrong?")
@@ -358,9 +564,16 @@ class AbstractFinTSHelper(metaclass=abc.ABCMeta):
         # FIXME See python-fints#114
         if not self.init_tan_request_serialized:
             return None
+        if self._init_tan_request_segment is None:
+            from fints.types import SegmentSequence
+
+            self._init_tan_request_segment = SegmentSequence(
+                self.init_tan_request_serialized
+            ).segments[0]
+
         return NeedTANResponse(
             None,
-            SegmentSequence(self.init_tan_request_serialized).segments[0],
+            self._init_tan_request_segment,
             "_continue_dialog_initialization",
             (self.client if self.client else self.get_readonly_client()).is_challenge_structured(),
         )
@@ -373,6 +586,7 @@ class AbstractFinTSHelper(metaclass=abc.ABCMeta):
 
     def reopen(self, **kwargs):
         self.close()
+        self._readonly_client = None
         for key, value in kwargs.items():
             setattr(self, key, value)
         self.open()
@@ -380,40 +594,91 @@ class AbstractFinTSHelper(metaclass=abc.ABCMeta):
     def close(self):
         if self.client:
             from_data = close_client(self.client, including_private=True)
-            self._do_save_client_data(from_data)
+            if from_data != self.from_data:
+                self._do_save_client_data(from_data)
             self.client = None
-
-    def get_readonly_client(self) -> FinTS3PinTanClient:
+            self._readonly_client = None
+            self._tan_mechanisms_client = None
+            self._tan_media_client = None
+
+    def get_readonly_client(self, pooled: bool = True) -> FinTS3PinTanClient:
+        """Return an offline client for the current state.
+
+        Pooled clients are cached (on the helper and in a small process-wide pool)
+        for as long as client arguments, client data and TAN mechanism are
+        unchanged. They are shared between requests and threads and must be
+        treated as strictly read-only: callers that change the client (e.g.
+        set_tan_mechanism()) or deconstruct() it must pass pooled=False to get
+        a private instance."""
         base_args = self._get_client_args()
+        from_data = self.from_data
+        if not pooled:
+            return self._build_readonly_client(base_args, from_data)
+
+        key = (
+            base_args,
+            self.tan_mechanism,
+            hashlib.blake2b(from_data or b"", digest_size=16).digest(),
+        )
+        if self._readonly_client is not None and self._readonly_client_key == key:
+            return self._readonly_client
+
+        client = _get_pooled_readonly_client(key)
+        if client is None:
+            client = self._build_readonly_client(base_args, from_data)
+            _put_pooled_readonly_client(key, client)
+        self._readonly_client = client
+        self._readonly_client_key = key
+        return client
+
+    def _build_readonly_client(self, base_args: Tuple[str, str, str], from_data) -> FinTS3PinTanClient:
         client = FinTS3PinTanClient(
             base_args[0],
             base_args[1],
             "XXX",
             base_args[2],
             product_id=BYRO_FINTS_PRODUCT_ID,
-            from_data=self.from_data,
+            from_data=from_data,
             mode=FinTSClientMode.OFFLINE,
         )
         if self.tan_mechanism is not None:
             client.set_tan_mechanism(self.tan_mechanism)
         return client
 
+    def get_information(self) -> dict:
+        """Return get_information() of the readonly client. The result is kept for as
+        long as that client is cached, callers get their own copy of it."""
+        client = self.get_readonly_client()
+        with _readonly_client_pool_lock:
+            information = _readonly_client_information.get(client)
+        if information is None:
+            information = client.get_information()
+            with _readonly_client_pool_lock:
+                _readonly_client_information[client] = information
+        return _copy_information(information)
+
     def get_tan_mechanisms(self):
+        if self.tan_mechanisms is not None and self._tan_mechanisms_client is self.client:
+            return self.tan_mechanisms
         self.tan_mechanisms = {
             k: f"{k}: {v.name} ({v.tech_id})"
             for (k, v) in self.client.get_tan_mechanisms().items()
         }
         if self.tan_mechanism is None and len(self.tan_mechanisms) > 0:
             self.tan_mechanism = list(self.tan_mechanisms.keys())[0]
-        print(self.tan_mechanisms)
+        self._tan_mechanisms_client = self.client
+        logger.debug("TAN mechanisms: %r", self.tan_mechanisms)
         return self.tan_mechanisms
 
     def get_tan_media(self):
+        if self.tan_media is not None and self._tan_media_client is self.client:
+            return self.tan_media
         _usage, tan_media = self.client.get_tan_media()
         self.tan_media = [tm.tan_medium_name for tm in tan_media]
         if self.tan_medium is None and len(self.tan_media) > 0:
             self.tan_medium = list(self.tan_media)[0]
-        print(self.tan_media)
+        self._tan_media_client = self.client
+        logger.debug("TAN media: %r", self.tan_media)
         return self.tan_media
 
     @staticmethod
@@ -423,6 +688,8 @@ class AbstractFinTSHelper(metaclass=abc.ABCMeta):
             tan_context = {"challenge": mark_safe(tan_request.challenge_html)}
 
             if tan_request.challenge_hhduc:
+                from fints.hhd.flicker import parse as hhd_flicker_parse
+
                 flicker = hhd_flicker_parse(tan_request.challenge_hhduc)
                 tan_context["challenge_flicker"] = flicker.render()
 
@@ -457,9 +724,13 @@ class AbstractFinTSHelper(metaclass=abc.ABCMeta):
 
 
 class FinTSHelper(AbstractFinTSHelper):
+    __slots__ = ("user_login_pk", "_user_login_cache", "_stored_pin")
+
     def __init__(self, request):
         super().__init__(request)
         self.user_login_pk: Optional[int] = None
+        self._user_login_cache = _UNSET
+        self._stored_pin: Optional[str] = None
 
     def _get_data_for_session(self) -> Tuple:
         return super()._get_data_for_session() + (
@@ -492,13 +763,34 @@ class FinTSHelper(AbstractFinTSHelper):
     def _restore_pin_state_from_securebox(self):
         if self.user_login_pk is None:
             return
-        if self.request.securebox.fetch_value(self.pin_label, Storage.TRANSIENT_ONLY, default=None) is not None:
+        # The transient storage lives in the session, so check it first and only
+        # hit the database for the permanent storage if needed. Remember the PIN
+        # so that the pin property doesn't have to look it up again.
+        pin = self.request.securebox.fetch_value(self.pin_label, Storage.TRANSIENT_ONLY, default=None)
+        if pin is not None:
             self.pin_state = PinState.SAVE_TEMPORARY
-        elif self.request.securebox.fetch_value(self.pin_label, Storage.PERMANENT_ONLY, default=None) is not None:
-            self.pin_state = PinState.SAVE_PERSISTENT
+        else:
+            pin = self.request.securebox.fetch_value(self.pin_label, Storage.PERMANENT_ONLY, default=None)
+            if pin is not None:
+                self.pin_state = PinState.SAVE_PERSISTENT
+        self._stored_pin = pin
 
     def load_from_user_login(self, user_login_pk: int):
         self.user_login_pk = user_login_pk
+        self._user_login_cache = _UNSET
+        self._load_from_current_user_login()
+
+    def load_from_user_login_instance(self, user_login: FinTSUserLogin):
+        """Same as load_from_user_login(), but for an already fetched FinTSUserLogin
+        (which should have its login selected), saving the query."""
+        if user_login.user_id != self.request.user.pk:
+            raise PermissionDenied("FinTS user login belongs to a different user")
+        self.user_login_pk = user_login.pk
+        self._user_login_cache = user_login
+        self._load_from_current_user_login()
+
+    def _load_from_current_user_login(self):
+        self._stored_pin = None
         self._restore_pin_state_from_securebox()
         user_login: FinTSUserLogin = self.get_user_login()
         self.tan_medium = user_login.selected_tan_medium
@@ -513,25 +805,25 @@ class FinTSHelper(AbstractFinTSHelper):
     def pin_label(self):
         user_login = self.get_user_login()
         assert user_login is not None
-        return "byro_fints__pin__{}__cache".format(user_login.login.pk)
+        return user_login.login.pin_cache_label
 
     @property
     def pin(self) -> str:
         if self.user_login_pk is not None:
-            pin = self.request.securebox.fetch_value(self.pin_label, default=None)
-            if pin is not None:
-                return pin
+            if self._stored_pin is None:
+                self._stored_pin = self.request.securebox.fetch_value(self.pin_label, default=None)
+            if self._stored_pin is not None:
+                return self._stored_pin
         return super().pin
 
     def save_pin(self, pin_state: PinState, pin: str):
         """Save pin in securebox, if requested."""
-        storage = None
-        if pin_state == PinState.SAVE_TEMPORARY:
-            storage = Storage.TRANSIENT_ONLY
-        elif pin_state == PinState.SAVE_PERSISTENT:
-            storage = Storage.PERMANENT_ONLY
+        storage = _PIN_STORAGE.get(pin_state)
         if storage is not None:
-            self.request.securebox.store_value(self.pin_label, pin, storage=storage)
+            # Re-submitting the same PIN with the same storage doesn't need another write
+            if pin_state is not self.pin_state or pin != self._stored_pin:
+                self.request.securebox.store_value(self.pin_label, pin, storage=storage)
+                self._stored_pin = pin
             self.pin_state = pin_state
         else:
             return super().save_pin(pin_state, pin)
@@ -545,13 +837,17 @@ class FinTSHelper(AbstractFinTSHelper):
         return self.get_user_login().fints_client_data
 
     def get_user_login(self) -> Optional[FinTSUserLogin]:
+        """Return the FinTSUserLogin for user_login_pk. The object is fetched once
+        per helper instance; changes made through the helper are saved on it."""
         if self.user_login_pk is None:
             return None
-        return (
-            FinTSUserLogin.objects.filter(pk=self.user_login_pk, user=self.request.user)
-            .select_related("login")
-            .first()
-        )
+        if self._user_login_cache is _UNSET:
+            self._user_login_cache = (
+                FinTSUserLogin.objects.filter(pk=self.user_login_pk, user=self.request.user)
+                .select_related("login")
+                .first()
+            )
+        return self._user_login_cache
 
     def _do_save_client_data(self, client_data: bytes):
         user_login = self.get_user_login()
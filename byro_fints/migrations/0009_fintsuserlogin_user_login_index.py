@@ -0,0 +1,19 @@
+# Generated by Django 3.2.25 on 2026-10-15 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("byro_fints", "0008_alter_fintsuserlogin_available_tan_media"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="fintsuserlogin",
+            index=models.Index(
+                fields=["user", "login"], name="byro_fints__user_id_25d2ff_idx"
+            ),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.utils.functional import cached_property
 from django.utils.translation import ugettext_lazy as _
 from enum import IntEnum
 from byro.common.models import LogTargetMixin
@@ -35,6 +36,11 @@ class FinTSLogin(models.Model, LogTargetMixin):
     def is_usable(self):
         return bool(self.blz and self.fints_url)
 
+    @cached_property
+    def pin_cache_label(self):
+        """Securebox label under which a user's PIN for this login is stored."""
+        return f"byro_fints__pin__{self.pk}__cache"
+
 
 class FinTSUserLogin(models.Model):
     login = models.ForeignKey(
@@ -66,6 +72,11 @@ class FinTSUserLogin(models.Model):
         default=None, null=True, blank=True, max_length=32
     )
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "login"]),
+        ]
+
 
 class FinTSAccountCapabilities(IntEnum):
     FETCH_TRANSACTIONS = 1
@@ -73,6 +84,11 @@ class FinTSAccountCapabilities(IntEnum):
     SEND_TRANSFER_MULTIPLE = 4
 
 
+# Plain int masks, so that the capability checks don't go through IntEnum
+_CAP_FETCH_TRANSACTIONS = FinTSAccountCapabilities.FETCH_TRANSACTIONS.value
+_CAP_SEND_TRANSFER = FinTSAccountCapabilities.SEND_TRANSFER.value
+
+
 class FinTSAccount(models.Model, LogTargetMixin):
     form_title = _("FinTS Account")
     LOG_TARGET_BASE = "byro_fints.account"
@@ -109,7 +125,7 @@ class FinTSAccount(models.Model, LogTargetMixin):
     caps = models.BigIntegerField(default=0)
 
     def can_fetch_transactions(self):
-        return bool(FinTSAccountCapabilities.FETCH_TRANSACTIONS & self.caps)
+        return bool(self.caps & _CAP_FETCH_TRANSACTIONS)
 
     def can_send_transfer(self):
-        return bool(FinTSAccountCapabilities.SEND_TRANSFER & self.caps)
+        return bool(self.caps & _CAP_SEND_TRANSFER)
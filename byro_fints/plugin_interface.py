@@ -1,4 +1,4 @@
-from typing import Optional, Dict, Type, Union, Tuple
+from typing import Optional, Dict, List, Type, Union, Tuple
 
 import django.http
 
@@ -7,12 +7,21 @@ from .models import FinTSLogin, FinTSUserLogin
 from .forms import PinRequestForm
 
 from fints.client import NeedTANResponse, TransactionResponse
+from fints.models import SEPAAccount
+
+
+def _find_account_by_iban(account_list: List[SEPAAccount], iban: str) -> Optional[SEPAAccount]:
+    accounts_by_iban = {}
+    for account in account_list:
+        accounts_by_iban.setdefault(account.iban.upper(), account)
+    return accounts_by_iban.get(iban.upper())
 
 
 class FinTSPluginInterface:
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._fintsinterface_form_cache = {}
+        self._fintsinterface_login_cache = {}
         self.request: Optional[django.http.HttpRequest] = None
 
     @classmethod
@@ -21,9 +30,15 @@ class FinTSPluginInterface:
         retval.request = request
         return retval
 
-    def get_fints(self, user_login_pk: int, clazz: Type[FinTSHelper] = FinTSHelper) -> FinTSHelper:
+    def get_fints(
+        self, user_login: Union[int, FinTSUserLogin], clazz: Type[FinTSHelper] = FinTSHelper
+    ) -> FinTSHelper:
+        """Return a helper for a FinTSUserLogin, given either by pk or as instance."""
         retval = clazz(self.request)
-        retval.load_from_user_login(user_login_pk)
+        if isinstance(user_login, FinTSUserLogin):
+            retval.load_from_user_login_instance(user_login)
+        else:
+            retval.load_from_user_login(user_login)
         return retval
 
     def get_bank_connections(self) -> Dict[int, dict]:
@@ -33,8 +48,7 @@ class FinTSPluginInterface:
         result = {}
 
         for fints_user_login in FinTSUserLogin.objects.filter(user=self.request.user).select_related('login'):
-            client = self.get_fints(fints_user_login.pk).get_readonly_client()
-            result[fints_user_login.pk] = client.get_information()
+            result[fints_user_login.pk] = self.get_fints(fints_user_login).get_information()
 
         return result
 
@@ -44,7 +58,7 @@ class FinTSPluginInterface:
             return self._fintsinterface_form_cache[cache_key]
 
         kwargs = {
-            "prefix": "fints_form_{}".format(form_type),
+            "prefix": f"fints_form_{form_type}",
         }
 
         if self.request.method in ("POST", "PUT"):
@@ -56,16 +70,26 @@ class FinTSPluginInterface:
             )
 
         form = PinRequestForm(**kwargs)
-        helper = FinTSHelper(self.request)
-        helper.load_from_user_login(fints_user_login.pk)
-        helper.augment_form_pin_fields(form)
+        self.get_fints(fints_user_login).augment_form_pin_fields(form)
 
         self._fintsinterface_form_cache[cache_key] = form
 
         return form
 
+    def _get_login(self, login_pk) -> Optional[FinTSLogin]:
+        if login_pk not in self._fintsinterface_login_cache:
+            self._fintsinterface_login_cache[login_pk] = FinTSLogin.objects.filter(pk=login_pk).first()
+        return self._fintsinterface_login_cache[login_pk]
+
     def _get_sepa_debit_form(self, fints_login: FinTSLogin):
-        return self._common_get_form("sepa_debit", fints_login.user_login.filter(user=self.request.user).first())
+        # The form only needs the PIN state, not the stored client data
+        fints_user_login = (
+            fints_login.user_login.filter(user=self.request.user)
+            .select_related("login")
+            .defer("fints_client_data")
+            .first()
+        )
+        return self._common_get_form("sepa_debit", fints_user_login)
 
     def _get_tan_request_form(self, fints_login, tan_request_data):
         extra_fields = self.get_tan_form_fields(
@@ -77,23 +101,20 @@ class FinTSPluginInterface:
         )
 
     def sepa_debit_init(self, login_pk):
-        fints_login = FinTSLogin.objects.filter(pk=login_pk).first()
+        fints_login = self._get_login(login_pk)
         form = self._get_sepa_debit_form(fints_login)
         return {
             "form": form,
         }
 
     def sepa_debit_do(self, login_pk, account_iban, **kwargs):
-        fints_login = FinTSLogin.objects.filter(pk=login_pk).first()
+        fints_login = self._get_login(login_pk)
         form = self._get_sepa_debit_form(fints_login)
 
         with self.fints_client(fints_login, form) as client:
             with client:
-                account_list = client.get_sepa_accounts()
-                for account in account_list:
-                    if account.iban.upper() == account_iban.upper():
-                        break
-                else:
+                account = _find_account_by_iban(client.get_sepa_accounts(), account_iban)
+                if account is None:
                     return "ACCOUNT NOT AVAILABLE"
 
                 response = client.sepa_debit(account=account, **kwargs)
@@ -107,7 +128,7 @@ class FinTSPluginInterface:
                     return response
 
     def tan_request_init(self, login_pk, transfer_uuid):
-        fints_login = FinTSLogin.objects.filter(pk=login_pk).first()
+        fints_login = self._get_login(login_pk)
         tan_request_data = self._tan_request_data(transfer_uuid)
 
         form = self._get_tan_request_form(fints_login, tan_request_data)
@@ -120,7 +141,7 @@ class FinTSPluginInterface:
         }
 
     def tan_request_send_tan(self, login_pk, transfer_uuid):
-        fints_login = FinTSLogin.objects.filter(pk=login_pk).first()
+        fints_login = self._get_login(login_pk)
         tan_request_data = self._tan_request_data(transfer_uuid)
 
         form = self._get_tan_request_form(fints_login, tan_request_data)
@@ -139,11 +160,8 @@ class FinTSPluginInterface:
 
 class SepaDDFinTSHelper(FinTSHelper):
     def sepa_dd(self, account_iban: str, **kwargs) -> Union[bool, TransactionResponse]:
-        account_list = self.client.get_sepa_accounts()
-        for account in account_list:
-            if account.iban.upper() == account_iban.upper():
-                break
-        else:
+        account = _find_account_by_iban(self.client.get_sepa_accounts(), account_iban)
+        if account is None:
             raise Exception("Account not found")
 
         response = self.client.sepa_debit(account=account, **kwargs)
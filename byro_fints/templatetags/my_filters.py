@@ -1,4 +1,3 @@
-import re
 from django.template.defaultfilters import register
 from django.utils.html import conditional_escape
 from django.utils.safestring import mark_safe
@@ -11,10 +10,9 @@ def lookup(data, key):
 
 @register.filter(name="format_iban")
 def format_iban(iban):
-    return mark_safe(
-        "&nbsp;".join(
-            conditional_escape(e)
-            for e in re.findall(r".{,4}", re.sub(r"\s", "", iban))
-            if e
-        )
-    )
+    iban = "".join(iban.split())
+    groups = [iban[i : i + 4] for i in range(0, len(iban), 4)]
+    if not iban.isalnum():
+        # Only malformed input can contain characters that need escaping
+        groups = [conditional_escape(e) for e in groups]
+    return mark_safe("&nbsp;".join(groups))
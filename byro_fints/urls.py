@@ -42,7 +42,12 @@ urlpatterns = [
         name="finance.fints.login.refresh",
     ),
     url(
-        r"^fints/login/(?P<pk>[0-9]+)/tan/(?P<uuid>[0-9a-fA-F-]+|test_data(?:_2)?)$",
+        r"^fints/login/(?P<pk>[0-9]+)/tan/(?P<uuid>[0-9a-fA-F-]+)$",
+        views.FinTSLoginTANRequestView.as_view(),
+        name="finance.fints.login.tan_request",
+    ),
+    url(
+        r"^fints/login/(?P<pk>[0-9]+)/tan/(?P<uuid>test_data|test_data_2)$",
         views.FinTSLoginTANRequestView.as_view(),
         name="finance.fints.login.tan_request",
     ),
@@ -1,52 +1,62 @@
-from datetime import date
+from collections import defaultdict
+from datetime import date, datetime
 
 from django import forms
 from django.db import transaction
+from django.db.models import Q
 from django.urls import reverse_lazy
+from django.utils.functional import cached_property
+from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
 from django.views.generic import FormView, TemplateView
 from django.views.generic.detail import SingleObjectMixin
 from fints.client import FinTSOperations
-from fints.models import SEPAAccount
 from mt940 import models as mt940_models
-from byro.bookkeeping.models import Account
+from byro.bookkeeping.models import Account, Booking, Transaction
 
-from .common import SessionBasedExisitingUserLoginFinTSHelperMixin
+from .common import SessionBasedExisitingUserLoginFinTSHelperMixin, _sepa_account
 from ..fints_interface import FinTSHelper
 from ..forms import PinRequestForm
 from ..models import FinTSAccount
 
 
+class AccountNameChoiceField(forms.ModelChoiceField):
+    def label_from_instance(self, obj):
+        return obj.name
+
+
+class LinkForm(forms.Form):
+    # The queryset is only evaluated when the field is rendered or cleaned
+    existing_account = AccountNameChoiceField(
+        queryset=Account.objects.filter(fints_account__isnull=True).only("pk", "name"),
+        empty_label=None,
+    )
+
+
 # FIXME: Allow inline create
 # FIXME: Name of default accounts?
 class FinTSAccountLinkView(SingleObjectMixin, FormView):
     template_name = "byro_fints/account_link.html"
     success_url = reverse_lazy("plugins:byro_fints:finance.fints.dashboard")
+    form_class = LinkForm
 
     model = FinTSAccount
+    queryset = FinTSAccount.objects.select_related("login")
     context_object_name = "fints_account"
 
-    @property
+    @cached_property
     def object(self):
         return self.get_object()
 
-    def get_form_class(self):
-        class LinkForm(forms.Form):
-            existing_account = forms.ChoiceField(
-                choices=[
-                    (a.pk, a.name)
-                    for a in Account.objects.all()
-                    if not hasattr(a, "fints_account")
-                ],
-                initial=self.object.account.pk if self.object.account else None,
-            )
-
-        return LinkForm
+    def get_initial(self):
+        initial = super().get_initial()
+        initial["existing_account"] = self.object.account_id
+        return initial
 
     @transaction.atomic
     def form_valid(self, form):
-        account = self.get_object()
-        account.account = Account.objects.get(pk=form.cleaned_data["existing_account"])
+        account = self.object
+        account.account = form.cleaned_data["existing_account"]
         account.save()
         account.log(self, ".linked", account=account.account)
         return super().form_valid(form)
@@ -57,22 +67,22 @@ class FinTSAccountInformationView(
 ):
     template_name = "byro_fints/account_information.html"
     model = FinTSAccount
+    queryset = FinTSAccount.objects.select_related("login")
     context_object_name = "fints_account"
     form_class = PinRequestForm
 
-    @property
+    @cached_property
     def object(self):
         return self.get_object()
 
     def get_context_data(self, *args, **kwargs):
         context = super().get_context_data(*args, **kwargs)
-        fints_account = self.get_object()
+        fints_account = self.object
         fints = FinTSHelper(self.request)
         fints.load_from_user_login(fints_account.login.user_login.filter(
                 user=self.request.user
-            ).first().pk)
-        client = fints.get_readonly_client()
-        context["information"] = client.get_information()
+            ).values_list("pk", flat=True).first())
+        context["information"] = fints.get_information()
         for account in context["information"]["accounts"]:
             if (account["iban"] == fints_account.iban) or (
                 account["account_number"] == fints_account.accountnumber
@@ -86,6 +96,45 @@ class FinTSAccountInformationView(
         return context
 
 
+# Handle JSON "But I cant't serialize that?!" nonsense
+_MT940_COERCERS = {
+    mt940_models.Amount: lambda v: {
+        "amount": str(v.amount),
+        "currency": v.currency,
+    },
+    mt940_models.Date: lambda v: v.isoformat(),
+}
+# Resolved coercer (or None) per concrete type, found along the MRO so that
+# subclasses such as mt940's SumAmount are converted like their base class
+_mt940_coercer_by_type = {}
+
+
+def _coerce_mt940_value(value):
+    value_type = type(value)
+    try:
+        coercer = _mt940_coercer_by_type[value_type]
+    except KeyError:
+        coercer = _mt940_coercer_by_type[value_type] = next(
+            (_MT940_COERCERS[t] for t in value_type.__mro__ if t in _MT940_COERCERS),
+            None,
+        )
+    return coercer(value) if coercer is not None else value
+
+
+def _as_date(value):
+    """Reduce a date or datetime to a date in the default time zone, so that dates handed to the ORM
+    compare equal to the datetimes read back from DateTimeFields."""
+    if isinstance(value, datetime):
+        if timezone.is_aware(value):
+            value = timezone.localtime(value, timezone.get_default_timezone())
+        return value.date()
+    return value
+
+
+def _booking_key(value_datetime, booking_datetime, amount, memo, status):
+    return (_as_date(value_datetime), _as_date(booking_datetime), amount, memo, status)
+
+
 class PinRequestAndDateForm(PinRequestForm):
     fetch_from_date = forms.DateField(label=_("Fetch start date"), required=True)
 
@@ -95,15 +144,16 @@ class FinTSAccountFetchView(SessionBasedExisitingUserLoginFinTSHelperMixin, Sing
     form_class = PinRequestAndDateForm
     success_url = reverse_lazy("plugins:byro_fints:finance.fints.dashboard")
     model = FinTSAccount
+    queryset = FinTSAccount.objects.select_related("login")
     context_object_name = "fints_account"
 
-    @property
+    @cached_property
     def object(self):
         return self.get_object()
 
     def get_form(self, *args, **kwargs):
         form = super().get_form(*args, **kwargs)
-        fints_account = self.get_object()
+        fints_account = self.object
         form.fields[
             "fetch_from_date"
         ].initial = fints_account.last_fetch_date or date.today().replace(
@@ -112,13 +162,15 @@ class FinTSAccountFetchView(SessionBasedExisitingUserLoginFinTSHelperMixin, Sing
         # FIXME Check for plus/minus 1 day
         return form
 
-    @transaction.atomic
     def form_valid(self, form):
-        fints_account = self.get_object()
+        fints_account = self.object
+        if fints_account.account_id is None:
+            form.add_error(
+                None, _("This account is not linked to a bookkeeping account yet.")
+            )
+            return super().form_invalid(form)
 
-        sepa_account = SEPAAccount(
-            **{name: getattr(fints_account, name) for name in SEPAAccount._fields}
-        )
+        sepa_account = _sepa_account(fints_account)
 
         with self.fints_client(fints_account.login, form) as client:
             with client:
@@ -130,32 +182,55 @@ class FinTSAccountFetchView(SessionBasedExisitingUserLoginFinTSHelperMixin, Sing
         if form.errors:
             return super().form_invalid(form)
 
+        # The bank dialog above runs outside of the database transaction, so that
+        # it doesn't hold the connection and locks for its network round-trips
+        self._import_transactions(fints_account, transactions)
+
+        return super().form_valid(form)
+
+    @transaction.atomic
+    def _import_transactions(self, fints_account, transactions):
+        # Load the data of all previously imported bookings on the fetched value dates
+        # at once, instead of querying for duplicates per transaction
+        existing_bookings = defaultdict(list)
+        for booking in Booking.objects.filter(
+            Q(debit_account_id=fints_account.account_id)
+            | Q(credit_account_id=fints_account.account_id),
+            importer="byro_fints",
+            transaction__value_datetime__in={t.data.get("date") for t in transactions},
+        ).values(
+            "transaction__value_datetime",
+            "booking_datetime",
+            "amount",
+            "memo",
+            "debit_account",
+            "data",
+        ):
+            key = _booking_key(
+                booking["transaction__value_datetime"],
+                booking["booking_datetime"],
+                booking["amount"],
+                booking["memo"],
+                "C" if booking["debit_account"] == fints_account.account_id else "D",
+            )
+            existing_bookings[key].append(booking["data"])
+
         for t in transactions:
+            get = t.data.get
             originator = "{} {} {}".format(
-                t.data.get("applicant_name") or "",
-                t.data.get("applicant_bin") or "",
-                t.data.get("applicant_iban") or "",
+                get("applicant_name") or "",
+                get("applicant_bin") or "",
+                get("applicant_iban") or "",
             )
             purpose = "{} {} | {}".format(
-                t.data.get("purpose") or "",
-                t.data.get("additional_purpose") or "",
-                t.data.get("posting_text") or "",
+                get("purpose") or "",
+                get("additional_purpose") or "",
+                get("posting_text") or "",
             )
 
-            # Handle JSON "But I cant't serialize that?!" nonsense
-            mt940_data = dict()
-            for k, v in t.data.items():
-                if isinstance(v, mt940_models.Amount):
-                    v = {
-                        "amount": str(v.amount),
-                        "currency": v.currency,
-                    }
-                elif isinstance(v, mt940_models.Date):
-                    v = v.isoformat()
+            mt940_data = {k: _coerce_mt940_value(v) for k, v in t.data.items()}
 
-                mt940_data[k] = v
-
-            amount = t.data.get("amount").amount
+            amount = get("amount").amount
             if amount < 0:
                 amount = -amount
                 status = "D"
@@ -168,7 +243,7 @@ class FinTSAccountFetchView(SessionBasedExisitingUserLoginFinTSHelperMixin, Sing
             )
 
             args = dict(
-                booking_datetime=t.data.get("entry_date"),
+                booking_datetime=get("entry_date"),
                 amount=amount,
                 importer="byro_fints",
                 memo=purpose,
@@ -186,15 +261,13 @@ class FinTSAccountFetchView(SessionBasedExisitingUserLoginFinTSHelperMixin, Sing
             else:
                 args["credit_account"] = fints_account.account
 
-            for booking in Booking.objects.filter(
-                transaction__value_datetime=t.data.get("date"),
-                **args,
-            ).all():
-                if booking.data == data:
-                    break
-            else:
+            key = _booking_key(
+                get("date"), args["booking_datetime"], amount, purpose, status
+            )
+            if data not in existing_bookings[key]:
+                existing_bookings[key].append(data)
                 tr = Transaction.objects.create(
-                    value_datetime=t.data.get("date"),
+                    value_datetime=get("date"),
                     user_or_context="FinTS fetch transactions",
                 )
                 if "debit_account" in args:
@@ -209,6 +282,4 @@ class FinTSAccountFetchView(SessionBasedExisitingUserLoginFinTSHelperMixin, Sing
                     )
 
         fints_account.last_fetch_date = date.today()
-        fints_account.save()
-
-        return super().form_valid(form)
+        fints_account.save(update_fields=["last_fetch_date"])
@@ -1,7 +1,9 @@
 from base64 import b64decode, b64encode
+from operator import attrgetter
 
 from fints.client import FinTSOperations
 from fints.formals import DescriptionRequired
+from fints.models import SEPAAccount
 
 from ..fints_interface import SessionBasedFinTSHelperMixin
 from ..models import FinTSAccount, FinTSAccountCapabilities
@@ -18,6 +20,25 @@ CAPABILITY_MAP = {
 }
 
 
+def _account_key(account):
+    """Fields identifying a FinTSAccount, for SEPAAccount and FinTSAccount alike."""
+    return (
+        account.iban,
+        account.bic,
+        account.accountnumber,
+        account.subaccount,
+        account.blz,
+    )
+
+
+_get_sepa_account_fields = attrgetter(*SEPAAccount._fields)
+
+
+def _sepa_account(fints_account):
+    """Build the SEPAAccount for a FinTSAccount."""
+    return SEPAAccount(*_get_sepa_account_fields(fints_account))
+
+
 def _fetch_update_accounts(
     fints_user_login, client, accounts=None, information=None, view=None
 ):
@@ -34,33 +55,61 @@ def _fetch_update_accounts(
     else:
         tan_media_result = None
 
+    existing_accounts = {
+        _account_key(fints_account): fints_account
+        for fints_account in FinTSAccount.objects.filter(
+            login=fints_login, iban__in=[account.iban for account in accounts]
+        )
+    }
+    new_accounts = []
+    changed_accounts = []
+    refreshed_accounts = []
+
+    # Index the bank's account information by IBAN; a later entry for the same
+    # IBAN wins, as it did with the nested scan
+    information_by_iban = {acc["iban"]: acc for acc in information["accounts"]}
+
     for account in accounts:
         extra_params = {}
-        for acc in information["accounts"]:
-            if acc["iban"] == account.iban:
-                extra_params["name"] = acc["product_name"]
-
-                caps = 0
-                for cap_provided, caps_searched in CAPABILITY_MAP.items():
-                    if any(
-                        information["bank"]["supported_operations"][cap_searched]
-                        and acc["supported_operations"][cap_searched]
-                        for cap_searched in caps_searched
-                    ):
-                        caps = caps | cap_provided.value
-                extra_params["caps"] = caps
-
-        account, created = FinTSAccount.objects.get_or_create(
-            login=fints_login, defaults=extra_params, **account._asdict()
-        )
-        if account.caps != caps:
-            account.caps = caps
-            account.save()
-        # FIXME: Create accounts in bookeeping?
-        if created:
-            account.log(view, ".created")
-        else:
-            account.log(view, ".refreshed")
+        acc = information_by_iban.get(account.iban)
+        if acc is not None:
+            extra_params["name"] = acc["product_name"]
+
+            caps = 0
+            for cap_provided, caps_searched in CAPABILITY_MAP.items():
+                if any(
+                    information["bank"]["supported_operations"][cap_searched]
+                    and acc["supported_operations"][cap_searched]
+                    for cap_searched in caps_searched
+                ):
+                    caps = caps | cap_provided.value
+            extra_params["caps"] = caps
+
+        fints_account = existing_accounts.get(_account_key(account))
+        if fints_account is None:
+            fints_account = FinTSAccount(
+                login=fints_login, **extra_params, **account._asdict()
+            )
+            # Don't create the same account twice if the bank lists it twice
+            existing_accounts[_account_key(account)] = fints_account
+            new_accounts.append(fints_account)
+            continue
+
+        if "caps" in extra_params and fints_account.caps != extra_params["caps"]:
+            fints_account.caps = extra_params["caps"]
+            # Accounts listed twice may not have been created yet
+            if fints_account.pk is not None and fints_account not in changed_accounts:
+                changed_accounts.append(fints_account)
+        refreshed_accounts.append(fints_account)
+
+    # FIXME: Create accounts in bookeeping?
+    FinTSAccount.objects.bulk_create(new_accounts)
+    if changed_accounts:
+        FinTSAccount.objects.bulk_update(changed_accounts, ["caps"])
+    for fints_account in new_accounts:
+        fints_account.log(view, ".created")
+    for fints_account in refreshed_accounts:
+        fints_account.log(view, ".refreshed")
 
     if tan_media_result:
         _usage_option, tan_media = tan_media_result
@@ -128,8 +177,10 @@ class SessionBasedExisitingUserLoginFinTSHelperMixin(SessionBasedFinTSHelperMixi
         if self.fints.user_login_pk is None:
             login = self.get_object()
             if login:
-                user_login = login.user_login.filter(
-                    user=self.request.user
-                ).first()
+                user_login = (
+                    login.user_login.filter(user=self.request.user)
+                    .select_related("login")
+                    .first()
+                )
                 if user_login:
-                    self.fints.load_from_user_login(user_login.pk)
+                    self.fints.load_from_user_login_instance(user_login)
@@ -5,7 +5,7 @@ from ..models import FinTSAccount, FinTSLogin, FinTSUserLogin
 
 class Dashboard(ListView):
     template_name = "byro_fints/dashboard.html"
-    queryset = FinTSLogin.objects.order_by("blz").all()
+    queryset = FinTSLogin.objects.order_by("blz")
     context_object_name = "fints_logins"
 
     def get_queryset(self):
@@ -19,7 +19,9 @@ class Dashboard(ListView):
 
     def get_context_data(self, *args, **kwargs):
         context = super().get_context_data(*args, **kwargs)
-        context["fints_accounts"] = FinTSAccount.objects.order_by("iban").all()
+        context["fints_accounts"] = (
+            FinTSAccount.objects.select_related("login", "account").order_by("iban")
+        )
         context["inactive_logins"] = (
             super().get_queryset().exclude(pk__in=self.get_queryset())
         )
@@ -2,6 +2,7 @@ from django import forms
 from django.contrib import messages
 from django.db import transaction
 from django.urls import reverse_lazy
+from django.utils.functional import cached_property
 from django.utils.translation import ugettext_lazy as _
 from django.views.generic import FormView, UpdateView
 from django.views.generic.detail import SingleObjectMixin
@@ -15,22 +16,23 @@ from .common import _fetch_update_accounts, SessionBasedExisitingUserLoginFinTSH
 from ..plugin_interface import FinTSPluginInterface
 
 
+FinTSLoginEditForm = forms.modelform_factory(FinTSLogin, fields=["name", "fints_url"])
+
+
 class FinTSLoginEditView(SessionBasedExisitingUserLoginFinTSHelperMixin, UpdateView):
     template_name = "byro_fints/login_edit.html"
     model = FinTSLogin
     context_object_name = "fints_login"
     success_url = reverse_lazy("plugins:byro_fints:finance.fints.dashboard")
-    fields = ["name", "fints_url"]
+    form_class = FinTSLoginEditForm
 
     def get_form(self, *args, **kwargs):
         form = super().get_form(*args, **kwargs)
 
-        fints_login = self.get_object()
-        fints_user_login = fints_login.user_login.filter(user=self.request.user).first()
+        fints_user_login = self.fints.get_user_login()
         tan_media_choices = []
 
-        client = self.fints.get_readonly_client()
-        information = client.get_information()
+        information = self.fints.get_information()
 
         if any(
             getattr(e, "description_required", None)
@@ -72,20 +74,15 @@ class FinTSLoginEditView(SessionBasedExisitingUserLoginFinTSHelperMixin, UpdateV
 
     @with_fints
     def form_valid(self, form):
-        fints_login = self.get_object()
+        fints_user_login = self.fints.get_user_login()
         if "tan_method" in form.changed_data:
-            fints_user_login = fints_login.user_login.filter(
-                user=self.request.user
-            ).first()
-            client: FinTS3PinTanClient = self.fints.get_readonly_client()
+            # The client is changed and deconstructed, so it must not come from the pool
+            client: FinTS3PinTanClient = self.fints.get_readonly_client(pooled=False)
             # FIXME Better API (without opening a dialog)
             client.set_tan_mechanism(form.cleaned_data["tan_method"])
             fints_user_login.fints_client_data = client.deconstruct(including_private=True)
             fints_user_login.save(update_fields=["fints_client_data"])
         if "tan_medium" in form.changed_data:
-            fints_user_login = fints_login.user_login.filter(
-                user=self.request.user
-            ).first()
             fints_user_login.selected_tan_medium = form.cleaned_data["tan_medium"]
             fints_user_login.save(update_fields=["selected_tan_medium"])
         return super().form_valid(form)
@@ -100,7 +97,7 @@ class FinTSLoginRefreshView(SingleObjectMixin, FormView):
     fints_interface: FinTSPluginInterface
     fints_helper: FinTSHelper
 
-    @property
+    @cached_property
     def object(self):
         return (
             self.get_object()
@@ -109,9 +106,9 @@ class FinTSLoginRefreshView(SingleObjectMixin, FormView):
     def setup(self, request, *args, **kwargs):
         super().setup(request, *args, **kwargs)
         self.fints_interface = FinTSPluginInterface.with_request(self.request)
-        self.fints_helper = self.fints_interface.get_fints(self.get_object().user_login.filter(
+        self.fints_helper = self.fints_interface.get_fints(self.object.user_login.filter(
                 user=self.request.user
-            ).first().pk)
+            ).values_list("pk", flat=True).first())
 
     def get_form(self, *args, **kwargs):
         form = super().get_form(*args, **kwargs)
@@ -121,9 +118,7 @@ class FinTSLoginRefreshView(SingleObjectMixin, FormView):
     @transaction.atomic
     @with_fints
     def form_valid(self, form):
-        fints_user_login = self.object.user_login.filter(
-            user=self.request.user
-        ).first()
+        fints_user_login = self.fints_helper.get_user_login()
         self.fints_helper.open()
 
         try:
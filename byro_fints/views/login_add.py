@@ -1,3 +1,4 @@
+import logging
 import uuid
 from base64 import b64encode
 from typing import Optional, Tuple
@@ -26,6 +27,8 @@ from .common import (
     _fetch_update_accounts,
 )
 
+logger = logging.getLogger(__name__)
+
 
 class FinTSHelperAddProcess(AbstractFinTSHelper):
     SAVE_PIN_IN_RESUME = True
@@ -111,7 +114,7 @@ class FinTSHelperAddProcess(AbstractFinTSHelper):
 
     def do_step2(self, tan_mechanism: Optional[str] = None) -> bool:
         if self.request and "override_selected_tan_medium" in self.request.GET:
-            print("Override triggered")
+            logger.debug("TAN medium override triggered")
             self.client.selected_tan_medium = self.request.GET["override_selected_tan_medium"]
         if len(self.tan_mechanisms) > 1 and tan_mechanism is None:
             return False
@@ -123,7 +126,7 @@ class FinTSHelperAddProcess(AbstractFinTSHelper):
     def do_step3(self, tan_medium: Optional[object] = None) -> bool:
         if self.client.is_tan_media_required() and not self.client.selected_tan_medium:
             if self.request and "override_selected_tan_medium" in self.request.GET:
-                print("Override triggered")
+                logger.debug("TAN medium override triggered")
                 self.client.selected_tan_medium = self.request.GET["override_selected_tan_medium"]
             self.get_tan_media()
             if len(self.tan_media) > 1 and tan_medium is None:
@@ -223,7 +226,6 @@ class FinTSLoginCreateStep2View(SessionBasedFinTSAddProcessHelperMixin, FormView
 
     def get_form(self, *args, **kwargs):
         form: forms.Form = super().get_form(*args, **kwargs)
-        print(self.fints.tan_mechanisms)
         form.fields["tan_mechanism"] = forms.ChoiceField(
             choices=self.fints.tan_mechanisms.items()
         )
@@ -264,7 +266,6 @@ class FinTSLoginCreateStep3View(SessionBasedFinTSAddProcessHelperMixin, FormView
 
     def get_form(self, *args, **kwargs):
         form: forms.Form = super().get_form(*args, **kwargs)
-        print(self.fints.tan_media)
         form.fields["tan_medium"] = forms.ChoiceField(
             choices=[(k, k) for k in self.fints.tan_media]
         )
@@ -2,15 +2,16 @@ from django import forms
 from django.contrib import messages
 from django.http import HttpResponseRedirect
 from django.urls import reverse, reverse_lazy
+from django.utils.functional import cached_property
 from django.utils.translation import ugettext_lazy as _
 from django.views.generic import FormView
 from django.views.generic.detail import SingleObjectMixin
 from fints.client import NeedTANResponse, TransactionResponse
-from fints.models import SEPAAccount
 from localflavor.generic.forms import BICFormField, IBANFormField
 
 from ..forms import PinRequestForm
 from ..models import FinTSAccount, FinTSLogin
+from .common import _sepa_account
 
 
 class SEPATransferForm(PinRequestForm):
@@ -29,18 +30,17 @@ class FinTSAccountTransferView(SingleObjectMixin, FormView):
     template_name = "byro_fints/account_transfer.html"
     form_class = SEPATransferForm
     model = FinTSAccount
+    queryset = FinTSAccount.objects.select_related("login")
     success_url = reverse_lazy("plugins:byro_fints:finance.fints.dashboard")
 
-    @property
+    @cached_property
     def object(self):
         return self.get_object()
 
     def form_valid(self, form):
         config = Configuration.get_solo()
-        fints_account = self.get_object()
-        sepa_account = SEPAAccount(
-            **{name: getattr(fints_account, name) for name in SEPAAccount._fields}
-        )
+        fints_account = self.object
+        sepa_account = _sepa_account(fints_account)
         transfer_log_data = {
             k: v for k, v in form.cleaned_data.items() if not k in ("pin", "store_pin")
         }
@@ -91,7 +91,7 @@ class FinTSAccountTransferView(SingleObjectMixin, FormView):
                             self, ".transfer.internal_error", transfer=transfer_log_data
                         )
                         messages.error(
-                            self.request, _("Invalid response: {}".format(response))
+                            self.request, _("Invalid response: {}").format(response)
                         )
                 except:
                     fints_account.log(
@@ -107,7 +107,7 @@ class FinTSLoginTANRequestView(SingleObjectMixin, FormView):
     model = FinTSLogin
     success_url = reverse_lazy("plugins:byro_fints:finance.fints.dashboard")
 
-    @property
+    @cached_property
     def object(self):
         return self.get_object()
 
@@ -128,7 +128,7 @@ class FinTSLoginTANRequestView(SingleObjectMixin, FormView):
         return context
 
     def form_valid(self, form):
-        fints_login = self.get_object()
+        fints_login = self.object
         # fints_account = fints_login. ... # FIXME
 
         with self.fints_client(fints_login, form) as client:
@@ -155,7 +155,7 @@ class FinTSLoginTANRequestView(SingleObjectMixin, FormView):
                             self, ".transfer.internal_error", uuid=self.kwargs["uuid"]
                         )
                         messages.error(
-                            self.request, _("Invalid response: {}".format(response))
+                            self.request, _("Invalid response: {}").format(response)
                         )
                 except:
                     fints_login.log(